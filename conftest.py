@@ -0,0 +1 @@
+# Makes the single-file simulator (cpu_simulator_fixed.py) importable from tests/.
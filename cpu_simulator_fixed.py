@@ -4,23 +4,24 @@ cpu_simulator_fixed.py
 
 - Deadline-Safe (energy-aware) scheduler
 - Performance-First (max-performance) baseline
-- Tkinter GUI with Matplotlib animation
+- Tkinter GUI with Matplotlib animation (Tk after() loop, artists updated in place)
 - Gantt bar, energy/freq/cores/util plots
 - Non-blocking Batch Run (CSV + per-run graphs), folder selectable
-- Fixes Matplotlib FuncAnimation warning (cache_frame_data=False)
 """
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
-import random
+import bisect
 import numpy as np
+from numba import njit, prange, config as numba_config
 import matplotlib
 matplotlib.use("TkAgg")
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from copy import deepcopy
+from matplotlib.patches import Rectangle
 import csv
 import os
 
@@ -34,186 +35,312 @@ K_POWER = 1.2
 DT = 0.05                   # simulation step (s)
 SIM_DURATION = 8.0
 
-# -----------------------
-# Task model + workload
-# -----------------------
-class Task:
-    def __init__(self, tid, wcet_sec, arrival, deadline):
-        self.tid = tid
-        self.wcet = wcet_sec
-        self.arrival = arrival
-        self.deadline = deadline
-        self.remaining = wcet_sec
-        self.start_time = None
-        self.finish_time = None
+@njit(cache=True)
+def max_steps(sim_duration, dt):
+    # upper bound on steps per run, shared by Stepper and the kernels: `now` accumulates dt with
+    # float drift, so a run can take one step past sim_duration/dt (8.0/0.05 -> 161 steps)
+    return int(sim_duration / dt) + 2
 
-    def is_ready(self, now): return (self.arrival <= now) and (self.remaining > 1e-12)
-    def is_done(self): return self.remaining <= 1e-12
+HIST_LEN = max_steps(SIM_DURATION, DT)
+# batch prange kernel is only ever entered from the (single) batch worker thread; workqueue is
+# always available and, unlike TBB, does not hang interpreter exit after use from a non-main thread
+numba_config.THREADING_LAYER = "workqueue"
 
+# -----------------------
+# Workload (SoA: parallel arrays, task id = index + 1)
+# -----------------------
 def generate_workload(seed=1, n=30):
-    random.seed(seed)
-    tasks = []
-    for i in range(n):
-        typ = random.choices(["light", "bursty", "heavy"], weights=[0.45,0.35,0.2])[0]
-        arrival = round(random.uniform(0, SIM_DURATION*0.8), 3)
-        if typ == "light":
-            wcet = random.uniform(0.05, 0.3)
-            deadline = arrival + random.uniform(0.8, 2.0)
-        elif typ == "bursty":
-            wcet = random.uniform(0.1, 0.4)
-            deadline = arrival + random.uniform(0.2, 0.8)
-        else:
-            wcet = random.uniform(0.6, 1.6)
-            deadline = arrival + random.uniform(1.0, 3.0)
-        tasks.append(Task(i+1, wcet, arrival, deadline))
-    tasks.sort(key=lambda t: t.arrival)
+    """Return (wcet, arrival, deadline) arrays, sorted by arrival."""
+    rng = np.random.default_rng(seed)   # local generator: no global RNG state, reentrant
+    # per task type (light, bursty, heavy): wcet range and relative-deadline range
+    wcet_range = np.array([[0.05, 0.3], [0.1, 0.4], [0.6, 1.6]])
+    window_range = np.array([[0.8, 2.0], [0.2, 0.8], [1.0, 3.0]])
+    typ = rng.choice(3, size=n, p=[0.45, 0.35, 0.2])
+    arrival = np.round(rng.uniform(0, SIM_DURATION*0.8, size=n), 3)
+    wcet = rng.uniform(wcet_range[typ, 0], wcet_range[typ, 1])
+    deadline = arrival + rng.uniform(window_range[typ, 0], window_range[typ, 1])
+    order = np.argsort(arrival, kind="stable")
+    wcet, arrival, deadline = wcet[order], arrival[order], deadline[order]
     # ensure at least one task at t=0 to make GUI show activity quickly
-    if tasks and tasks[0].arrival > 0:
-        tasks[0].arrival = 0.0
-    return tasks
+    if n and arrival[0] > 0:
+        arrival[0] = 0.0
+    return wcet, arrival, deadline
 
 # -----------------------
-# Utility functions
+# Power & frequency model (lookup tables indexed [freq_idx, cores-1])
 # -----------------------
-def cycles_per_second(freq_frac, cores):
-    return freq_frac * PERF_CONSTANT * cores * 1000.0
+CPS_TABLE = np.array([[f * PERF_CONSTANT * n * 1000.0 for n in range(1, MAX_CORES+1)] for f in FREQ_LEVELS])   # cycles/s
+PWR_TABLE = K_POWER * np.array(FREQ_LEVELS)[:, None]**3 * np.arange(1, MAX_CORES+1)[None, :]                    # W
+MAX_FREQ_IDX = int(np.argmax(FREQ_LEVELS))
 
-def power_for(freq_frac, cores):
-    return K_POWER * (freq_frac ** 3) * cores
+# every (freq_idx, cores, energy_est) candidate, cheapest first; constant for the whole run
+CONFIG_GRID = sorted([(fi, n, PWR_TABLE[fi, n-1] * DT) for fi in range(len(FREQ_LEVELS)) for n in range(1, MAX_CORES+1)], key=lambda c: c[2])
 
 # -----------------------
 # Scheduler steppers
 # -----------------------
-class DeadlineSafeStepper:
-    def __init__(self, tasks):
-        self.tasks = deepcopy(tasks)
+# GUI/batch scheduler label -> Stepper policy
+POLICIES = {"Deadline-Safe": "edf_dvfs", "Performance-First": "max_perf"}
+
+def _dispatch(rem_sorted, cap_sec):
+    """EDF work allocation: each task (deadline order) gets what is left after the earlier ones."""
+    prefix = np.concatenate(([0.0], np.cumsum(rem_sorted)[:-1]))
+    return np.clip(cap_sec - prefix, 0.0, rem_sorted)
+
+class Stepper:
+    """EDF stepper; the policy only decides the (freq, cores) config each step.
+
+    'edf_dvfs' -- cheapest config that keeps the ready set EDF-schedulable (Deadline-Safe)
+    'max_perf' -- always max frequency and all cores (Performance-First baseline)
+    """
+    def __init__(self, wcet, arrival, deadline, policy="edf_dvfs"):
+        if policy not in POLICIES.values():
+            raise ValueError(f"Unknown policy: {policy!r}")
+        self.policy = policy
+        # task state kept as parallel arrays (SoA) so feasibility/dispatch are vectorized;
+        # arrival/deadline are read-only and shared, only remaining work is copied
+        self.n_tasks = len(wcet)
+        self.tid = np.arange(1, self.n_tasks+1)
+        self.rem = wcet.copy()
+        self.arrival = arrival
+        self.deadline = deadline
+        self.start_time = np.full(self.n_tasks, np.nan)
+        self.finish_time = np.full(self.n_tasks, np.nan)
+        # incremental ready queue: pending tasks in arrival order, ready tasks kept EDF-sorted
+        self._by_arrival = np.argsort(self.arrival, kind="stable")
+        self._arr_idx = 0
+        self._ready = []    # sorted (deadline, idx); completed tasks are always a prefix
         self.now = 0.0
-        self.freq = max(FREQ_LEVELS)
+        self.freq_idx = MAX_FREQ_IDX
         self.cores = MAX_CORES
         self.energy = 0.0
-        self.history = {"t":[], "energy":[], "freq":[], "cores":[], "util":[], "running_task":[]}
+        # preallocated history; the first self.i entries are valid. Stored compactly:
+        # freq as an index into FREQ_LEVELS, cores int8, energy/util float32
+        self.hist_t = np.empty(HIST_LEN)
+        self.hist_energy = np.empty(HIST_LEN, dtype=np.float32)
+        self.hist_freq_idx = np.empty(HIST_LEN, dtype=np.int8)
+        self.hist_cores = np.empty(HIST_LEN, dtype=np.int8)
+        self.hist_util = np.empty(HIST_LEN, dtype=np.float32)
+        self.hist_running = np.empty(HIST_LEN, dtype=int)   # task id, -1 when idle
+        self.i = 0
+
+    def _advance_arrivals(self, now):
+        while self._arr_idx < self.n_tasks:
+            i = int(self._by_arrival[self._arr_idx])
+            if self.arrival[i] > now:
+                break
+            bisect.insort(self._ready, (self.deadline[i], i))
+            self._arr_idx += 1
 
     def runnable(self):
-        return [t for t in self.tasks if t.is_ready(self.now)]
-
-    def feasibility_check(self, cand_freq, cand_cores):
-        for t in self.runnable():
-            time_needed = t.remaining / (cand_cores * cand_freq if cand_cores*cand_freq>0 else 1e-9)
-            if self.now + time_needed > t.deadline + 1e-9:
-                return False
-        return True
-
-    def choose_config(self):
-        best = None
-        for f in FREQ_LEVELS:
-            for n in range(1, MAX_CORES+1):
-                if not self.feasibility_check(f, n): 
-                    continue
-                energy_est = power_for(f, n) * DT
-                if best is None or energy_est < best[2]:
-                    best = (f, n, energy_est)
-        if best is None:
-            # fallback to max perf to make progress
-            return max(FREQ_LEVELS), MAX_CORES
-        return best[0], best[1]
+        # already deadline-sorted (EDF order)
+        return np.array([i for _, i in self._ready], dtype=int)
+
+    def is_finished(self):
+        all_done = self._arr_idx == self.n_tasks and not self._ready
+        return all_done or self.now >= SIM_DURATION
+
+    def missed(self):
+        late = self.finish_time > self.deadline   # NaN (unfinished) compares False
+        overdue = (self.rem > 0) & (self.now > self.deadline)
+        return int(np.count_nonzero(late | overdue))
+
+    def required_capacity(self, order):
+        # EDF schedulability: the k-th deadline must cover the work of all k earlier-or-equal deadlines,
+        # so the smallest usable freq*cores is max_k cum_k / slack_k (inf if a deadline already passed)
+        if order.size == 0:
+            return 0.0
+        cum = np.cumsum(self.rem[order])
+        slack = self.deadline[order] - self.now + 1e-9
+        if np.any(slack <= 0):
+            return np.inf
+        return float((cum / slack).max())
+
+    def choose_config(self, order):
+        if self.policy == "max_perf":
+            return MAX_FREQ_IDX, MAX_CORES
+        # grid is in energy order, so the first config meeting the bound is the cheapest
+        req = self.required_capacity(order)
+        for fi, n, _ in CONFIG_GRID:
+            if FREQ_LEVELS[fi] * n >= req:
+                return fi, n
+        # fallback to max perf to make progress
+        return MAX_FREQ_IDX, MAX_CORES
 
     def step(self, dt=DT):
         # stop condition: all done or time exceeded
-        if all(t.is_done() for t in self.tasks) or self.now >= SIM_DURATION:
+        if self.is_finished():
             return False
 
-        f, n = self.choose_config()
-        self.freq, self.cores = f, n
+        self._advance_arrivals(self.now)
+        order = self.runnable()    # EDF order, built once per step and shared with choose_config
+        fi, n = self.choose_config(order)
+        self.freq_idx, self.cores = fi, n
 
-        runnable = sorted(self.runnable(), key=lambda t: (t.deadline if t.deadline is not None else 1e9))
-        cap = cycles_per_second(self.freq, self.cores) * dt
-        running_tid = None
-        work_done = 0.0
+        cap = CPS_TABLE[self.freq_idx, self.cores-1] * dt
+        cap_sec = cap / (PERF_CONSTANT * 1000.0)
 
-        for t in runnable:
-            if cap <= 0: break
-            cap_sec = cap / (PERF_CONSTANT * 1000.0)
-            do = min(t.remaining, cap_sec)
-            if do <= 0:
-                do = min(1e-6, t.remaining)  # small progress guard
-            if t.start_time is None and do > 0:
-                t.start_time = self.now
-            t.remaining -= do
-            work_done += do
-            running_tid = t.tid
-            cap -= do * (PERF_CONSTANT * 1000.0)
-            if t.is_done():
-                t.finish_time = self.now + dt
-            if cap <= 0: break
+        rem_sorted = self.rem[order]
+        served = _dispatch(rem_sorted, cap_sec)
+        self.rem[order] = rem_sorted - served
+        work_done = float(served.sum())
+
+        touched = order[served > 0]
+        fresh = touched[np.isnan(self.start_time[touched])]
+        self.start_time[fresh] = self.now
+        done = touched[self.rem[touched] == 0]   # fully served tasks hit exactly 0 (rem - rem)
+        self.finish_time[done] = self.now + dt
+        del self._ready[:done.size]
+        running_tid = int(self.tid[touched[-1]]) if touched.size else -1
 
-        p = power_for(self.freq, self.cores)
+        p = PWR_TABLE[self.freq_idx, self.cores-1]
         self.energy += p * dt
         self.now += dt
-        util = (work_done / (self.cores * self.freq * dt)) if (self.cores * self.freq * dt) > 0 else 0.0
+        freq = FREQ_LEVELS[self.freq_idx]
+        util = work_done / (self.cores * freq * dt)
 
-        self.history["t"].append(self.now)
-        self.history["energy"].append(self.energy)
-        self.history["freq"].append(self.freq)
-        self.history["cores"].append(self.cores)
-        self.history["util"].append(util)
-        self.history["running_task"].append(running_tid)
+        self.hist_t[self.i] = self.now
+        self.hist_energy[self.i] = self.energy
+        self.hist_freq_idx[self.i] = self.freq_idx
+        self.hist_cores[self.i] = self.cores
+        self.hist_util[self.i] = util
+        self.hist_running[self.i] = running_tid
+        self.i += 1
 
-        return not (all(t.is_done() for t in self.tasks) or self.now >= SIM_DURATION)
+        return not self.is_finished()
 
-class PerformanceFirstStepper:
-    def __init__(self, tasks):
-        self.tasks = deepcopy(tasks)
-        self.now = 0.0
-        self.freq = max(FREQ_LEVELS)
-        self.cores = MAX_CORES
-        self.energy = 0.0
-        self.history = {"t":[], "energy":[], "freq":[], "cores":[], "util":[], "running_task":[]}
-
-    def runnable(self):
-        return [t for t in self.tasks if t.is_ready(self.now)]
-
-    def choose_config(self):
-        return max(FREQ_LEVELS), MAX_CORES
-
-    def step(self, dt=DT):
-        if all(t.is_done() for t in self.tasks) or self.now >= SIM_DURATION:
-            return False
-
-        self.freq, self.cores = self.choose_config()
-        runnable = sorted(self.runnable(), key=lambda t: (t.deadline if t.deadline is not None else 1e9))
-        cap = cycles_per_second(self.freq, self.cores) * dt
-        running_tid = None
+# -----------------------
+# JIT batch kernel (no GUI)
+# -----------------------
+MODE_DEADLINE_SAFE = 0
+MODE_PERFORMANCE_FIRST = 1
+# Stepper policy -> kernel mode (labels go through POLICIES first, so GUI and batch agree)
+KERNEL_MODES = {"edf_dvfs": MODE_DEADLINE_SAFE, "max_perf": MODE_PERFORMANCE_FIRST}
+
+@njit(cache=True)
+def run_to_completion(rem, arrival, deadline, mode, freq_levels, max_cores, dt, sim_duration):
+    """Run one full simulation; same model as the steppers, flattened into loops for Numba.
+
+    Returns (energy, missed, hist_t, hist_energy, hist_freq, hist_cores, hist_util).
+    """
+    rem = rem.copy()
+    n_tasks = rem.shape[0]
+    n_steps = max_steps(sim_duration, dt)
+    hist_t = np.empty(n_steps)
+    hist_energy = np.empty(n_steps)
+    hist_freq = np.empty(n_steps)
+    hist_cores = np.empty(n_steps, dtype=np.int64)
+    hist_util = np.empty(n_steps)
+    finish = np.full(n_tasks, np.nan)
+    edf = np.argsort(deadline, kind="mergesort")
+    f_max = freq_levels.max()
+
+    now = 0.0
+    energy = 0.0
+    k = 0
+    while k < n_steps:
+        # stop condition: all done or time exceeded
+        all_done = True
+        for i in range(n_tasks):
+            if rem[i] > 0:
+                all_done = False
+                break
+        if all_done or now >= sim_duration:
+            break
+
+        # choose config (falls back to max perf when nothing is feasible)
+        f = f_max
+        n = max_cores
+        if mode == MODE_DEADLINE_SAFE:
+            # single EDF pass for the minimum freq*cores product (see Stepper.required_capacity)
+            req = 0.0
+            cum = 0.0
+            for j in range(n_tasks):
+                i = edf[j]
+                if arrival[i] <= now and rem[i] > 0:
+                    cum += rem[i]
+                    slack = deadline[i] - now + 1e-9
+                    if slack <= 0:
+                        req = np.inf
+                        break
+                    req = max(req, cum / slack)
+            best = np.inf
+            for fc in freq_levels:
+                for nc in range(1, max_cores+1):
+                    if fc * nc >= req:
+                        energy_est = K_POWER * (fc ** 3) * nc * dt
+                        if energy_est < best:
+                            best = energy_est
+                            f = fc
+                            n = nc
+
+        # EDF dispatch
+        cap_sec = f * PERF_CONSTANT * n * 1000.0 * dt / (PERF_CONSTANT * 1000.0)
         work_done = 0.0
-
-        for t in runnable:
-            if cap <= 0: break
-            cap_sec = cap / (PERF_CONSTANT * 1000.0)
-            do = min(t.remaining, cap_sec)
+        for j in range(n_tasks):
+            if cap_sec <= 0:
+                break
+            i = edf[j]
+            if not (arrival[i] <= now and rem[i] > 0):
+                continue
+            do = min(rem[i], cap_sec)
             if do <= 0:
-                do = min(1e-6, t.remaining)
-            if t.start_time is None and do > 0:
-                t.start_time = self.now
-            t.remaining -= do
+                break
+            rem[i] -= do
             work_done += do
-            running_tid = t.tid
-            cap -= do * (PERF_CONSTANT * 1000.0)
-            if t.is_done():
-                t.finish_time = self.now + dt
-            if cap <= 0: break
-
-        p = power_for(self.freq, self.cores)
-        self.energy += p * dt
-        self.now += dt
-        util = (work_done / (self.cores * self.freq * dt)) if (self.cores * self.freq * dt) > 0 else 0.0
-
-        self.history["t"].append(self.now)
-        self.history["energy"].append(self.energy)
-        self.history["freq"].append(self.freq)
-        self.history["cores"].append(self.cores)
-        self.history["util"].append(util)
-        self.history["running_task"].append(running_tid)
-
-        return not (all(t.is_done() for t in self.tasks) or self.now >= SIM_DURATION)
+            cap_sec -= do
+            if rem[i] == 0:
+                finish[i] = now + dt
+
+        energy += K_POWER * (f ** 3) * n * dt
+        now += dt
+        hist_t[k] = now
+        hist_energy[k] = energy
+        hist_freq[k] = f
+        hist_cores[k] = n
+        hist_util[k] = work_done / (n * f * dt)
+        k += 1
+
+    missed = 0
+    for i in range(n_tasks):
+        if finish[i] > deadline[i] or (rem[i] > 0 and now > deadline[i]):
+            missed += 1
+    return energy, missed, hist_t[:k], hist_energy[:k], hist_freq[:k], hist_cores[:k], hist_util[:k]
+
+@njit(parallel=True, cache=True)
+def run_all(wcet, arrival, deadline, modes, freq_levels, max_cores, dt, sim_duration):
+    """Run one simulation per row of the (n_runs, n_tasks) workload arrays in parallel, row r under modes[r].
+
+    Returns (energy, missed, steps, hist_t, hist_energy); row i of the histories is valid up to steps[i].
+    """
+    n_runs = wcet.shape[0]
+    n_steps = max_steps(sim_duration, dt)
+    energy = np.empty(n_runs)
+    missed = np.empty(n_runs, dtype=np.int64)
+    steps = np.empty(n_runs, dtype=np.int64)
+    hist_t = np.zeros((n_runs, n_steps))
+    hist_energy = np.zeros((n_runs, n_steps))
+    for r in prange(n_runs):
+        e, m, t, h, _, _, _ = run_to_completion(wcet[r], arrival[r], deadline[r], modes[r], freq_levels, max_cores, dt, sim_duration)
+        energy[r] = e
+        missed[r] = m
+        steps[r] = t.shape[0]
+        hist_t[r, :t.shape[0]] = t
+        hist_energy[r, :t.shape[0]] = h
+    return energy, missed, steps, hist_t, hist_energy
+
+def _simulate_batch(runs):
+    """All (scheduler label, seed) batch runs in one run_all call; workloads match the GUI's."""
+    workloads = [generate_workload(seed=seed, n=30) for _, seed in runs]
+    wcet, arrival, deadline = (np.stack(a) for a in zip(*workloads))
+    modes = np.array([KERNEL_MODES[POLICIES[sched]] for sched, _ in runs], dtype=np.int64)
+    energy, missed, steps, hist_t, hist_energy = run_all(
+        wcet, arrival, deadline, modes, np.array(FREQ_LEVELS), MAX_CORES, DT, SIM_DURATION)
+    out = []
+    for r, (sched, seed) in enumerate(runs):
+        row = {"scheduler":sched, "seed":seed, "energy":float(energy[r]), "tasks":wcet.shape[1], "missed":int(missed[r])}
+        out.append((row, hist_t[r, :steps[r]], hist_energy[r, :steps[r]]))
+    return out
 
 # -----------------------
 # GUI + animation + batch
@@ -229,7 +356,7 @@ class CPUSimApp:
 
         ttk.Label(ctrl, text="Scheduler:").grid(row=0, column=0, sticky=tk.W)
         self.sched_var = tk.StringVar(value="Deadline-Safe")
-        ttk.Combobox(ctrl, textvariable=self.sched_var, values=["Deadline-Safe", "Performance-First"], width=20).grid(row=0, column=1, sticky=tk.W)
+        ttk.Combobox(ctrl, textvariable=self.sched_var, values=list(POLICIES), state="readonly", width=20).grid(row=0, column=1, sticky=tk.W)
 
         ttk.Label(ctrl, text="Seed:").grid(row=0, column=2, sticky=tk.W, padx=(8,0))
         self.seed_var = tk.IntVar(value=1)
@@ -268,29 +395,55 @@ class CPUSimApp:
 
         # internal
         self.stepper = None
-        self.ani = None
         self.running = False
+        self._after_id = None    # pending Tk after() callback for the next tick
 
         self._init_plots()
 
     def _init_plots(self):
         for ax in self.axs:
             ax.clear(); ax.grid(True)
+            ax.set_xlim(0, SIM_DURATION)
         self.axs[0].set_title("Cumulative Energy (J)")
         self.axs[1].set_title("CPU Frequency (frac)")
         self.axs[2].set_title("Active Cores")
         self.axs[3].set_title("Utilization (est)")
+        self.axs[0].set_ylabel("Energy (J)")
+        self.axs[1].set_ylabel("Freq")
+        self.axs[2].set_ylabel("Cores")
+        self.axs[3].set_ylabel("Util")
+        self.axs[3].set_xlabel("Time (s)")
+        # freq/cores/util have fixed model bounds; energy autoscales in _tick
+        self.axs[1].set_ylim(0, max(FREQ_LEVELS) * 1.1)
+        self.axs[2].set_ylim(0, MAX_CORES + 0.5)
+        self.axs[3].set_ylim(0, 1.1)
+        # line artists are created once and updated with set_data each frame
+        self.energy_line, = self.axs[0].plot([], [], color='tab:blue')
+        self.freq_line, = self.axs[1].plot([], [], color='tab:orange', drawstyle='steps-post')
+        self.cores_line, = self.axs[2].plot([], [], color='tab:green', drawstyle='steps-post')
+        self.util_line, = self.axs[3].plot([], [], color='tab:red')
         # clear gantt
         self.gantt_ax.cla()
         self.gantt_ax.set_xlim(0, SIM_DURATION)
         self.gantt_ax.set_ylim(0,1)
         self.gantt_ax.set_yticks([])
         self.gantt_ax.set_xlabel("Time (s)")
+        self.gantt_bar = self.gantt_ax.add_patch(Rectangle((0, 0.2), DT, 0.6, facecolor='tab:purple', visible=False))
+        self.gantt_text = self.gantt_ax.text(0.5, 0.5, "", va='center', ha='center')
         self.canvas.draw()
 
+    def _cancel_tick(self):
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+
     def start(self):
         if self.running:
             return
+        sched = self.sched_var.get()
+        if sched not in POLICIES:
+            messagebox.showerror("Start", f"Unknown scheduler: {sched!r}")
+            return
         self.running = True
         self.start_btn.config(state=tk.DISABLED)
         self.pause_btn.config(state=tk.NORMAL)
@@ -298,15 +451,13 @@ class CPUSimApp:
         self.batch_btn.config(state=tk.DISABLED)
 
         seed = int(self.seed_var.get())
-        sched = self.sched_var.get()
-        tasks = generate_workload(seed=seed, n=30)
-        if sched == "Deadline-Safe":
-            self.stepper = DeadlineSafeStepper(tasks)
-        else:
-            self.stepper = PerformanceFirstStepper(tasks)
+        workload = generate_workload(seed=seed, n=30)
+        self.stepper = Stepper(*workload, policy=POLICIES[sched])
+        self._init_plots()
 
-        # FuncAnimation with cache_frame_data=False to silence the warning
-        self.ani = FuncAnimation(self.fig, self._update_frame, interval=50, blit=False, cache_frame_data=False)
+        # Tk after() loop drives the sim; redraws are coalesced via draw_idle
+        self._cancel_tick()
+        self._after_id = self.master.after(50, self._tick)
         self.status_label.config(text=f"Running ({sched})")
 
     def pause(self):
@@ -317,14 +468,11 @@ class CPUSimApp:
         self.pause_btn.config(state=tk.DISABLED)
         self.reset_btn.config(state=tk.NORMAL)
         self.batch_btn.config(state=tk.NORMAL)
-        if self.ani:
-            self.ani.event_source.stop()
+        self._cancel_tick()
         self.status_label.config(text="Paused")
 
     def reset(self):
-        if self.ani:
-            self.ani.event_source.stop()
-            self.ani = None
+        self._cancel_tick()
         self.stepper = None
         self.running = False
         self.start_btn.config(state=tk.NORMAL)
@@ -334,66 +482,66 @@ class CPUSimApp:
         self._init_plots()
         self.status_label.config(text="Reset / Ready")
 
-    def _update_frame(self, frame):
-        # run several logical steps depending on speed
-        if self.stepper is None:
+    def _tick(self):
+        self._after_id = None
+        if not self.running or self.stepper is None:
             return
 
+        # run several logical steps depending on speed, then redraw once
+        st = self.stepper
+        k_before = st.i
         speed = float(self.speed_var.get())
         steps = max(1, int(round(speed)))
         cont = True
         for _ in range(steps):
-            cont = self.stepper.step(DT)
+            cont = st.step(DT)
             if not cont:
                 break
 
-        hist = self.stepper.history
-        t = np.array(hist["t"])
-        if t.size == 0:
-            # still no data to plot
-            return
-
-        energy = np.array(hist["energy"])
-        freq = np.array(hist["freq"])
-        cores = np.array(hist["cores"])
-        util = np.array(hist["util"])
-        running = hist["running_task"]
+        k = st.i
+        if k != k_before:
+            self._update_artists(st, k)
+            self.canvas.draw_idle()
 
-        # update plots
-        self.axs[0].cla(); self.axs[0].plot(t, energy, color='tab:blue'); self.axs[0].set_ylabel("Energy (J)"); self.axs[0].grid(True)
-        self.axs[1].cla(); self.axs[1].step(t, freq, where='post', color='tab:orange'); self.axs[1].set_ylabel("Freq"); self.axs[1].grid(True)
-        self.axs[2].cla(); self.axs[2].step(t, cores, where='post', color='tab:green'); self.axs[2].set_ylabel("Cores"); self.axs[2].grid(True)
-        self.axs[3].cla(); self.axs[3].plot(t, util, color='tab:red'); self.axs[3].set_ylabel("Util"); self.axs[3].grid(True)
-        self.axs[3].set_xlabel("Time (s)")
-
-        # update gantt (reuse single axes)
-        self.gantt_ax.cla()
-        self.gantt_ax.set_xlim(0, SIM_DURATION)
-        self.gantt_ax.set_ylim(0, 1)
-        self.gantt_ax.set_yticks([])
-        last_running = running[-1]
-        last_t = t[-1]
-        if last_running is not None:
-            self.gantt_ax.broken_barh([(max(0, last_t - DT), DT)], (0.2, 0.6), facecolors=('tab:purple'))
-            self.gantt_ax.text(last_t, 0.5, f"Task: {last_running}", va='center', ha='left')
-        else:
-            self.gantt_ax.text(0.5, 0.5, "Idle", va='center', ha='center')
-
-        # stats to show
-        total_tasks = len(self.stepper.tasks)
-        missed = sum(1 for tsk in self.stepper.tasks if (tsk.deadline is not None and ((tsk.finish_time is not None and tsk.finish_time > tsk.deadline) or (not tsk.is_done() and self.stepper.now > tsk.deadline))))
         if not cont:
             # finished
-            if self.ani:
-                self.ani.event_source.stop()
             self.running = False
-            self.status_label.config(text=f"Done — Energy={self.stepper.energy:.3f}J | Tasks={total_tasks} | Missed={missed}")
+            self.status_label.config(text=f"Done — Energy={st.energy:.3f}J | Tasks={st.n_tasks} | Missed={st.missed()}")
             self.start_btn.config(state=tk.NORMAL)
             self.pause_btn.config(state=tk.DISABLED)
             self.reset_btn.config(state=tk.NORMAL)
             self.batch_btn.config(state=tk.NORMAL)
+            return
 
-        self.canvas.draw()
+        self._after_id = self.master.after(50, self._tick)
+
+    def _update_artists(self, st, k):
+        # views into the preallocated history, no per-frame list->array copies
+        t = st.hist_t[:k]
+        energy = st.hist_energy[:k]
+
+        # update plots
+        self.energy_line.set_data(t, energy)
+        self.freq_line.set_data(t, np.take(FREQ_LEVELS, st.hist_freq_idx[:k]))
+        self.cores_line.set_data(t, st.hist_cores[:k])
+        self.util_line.set_data(t, st.hist_util[:k])
+        self.axs[0].relim()
+        self.axs[0].autoscale_view(scalex=False)
+
+        # update gantt (reuse single bar + label)
+        last_running = st.hist_running[k-1]
+        last_t = t[-1]
+        if last_running >= 0:
+            self.gantt_bar.set_x(max(0, last_t - DT))
+            self.gantt_bar.set_visible(True)
+            self.gantt_text.set_position((last_t, 0.5))
+            self.gantt_text.set_horizontalalignment('left')
+            self.gantt_text.set_text(f"Task: {last_running}")
+        else:
+            self.gantt_bar.set_visible(False)
+            self.gantt_text.set_position((0.5, 0.5))
+            self.gantt_text.set_horizontalalignment('center')
+            self.gantt_text.set_text("Idle")
 
     # -----------------------
     # Batch run (non-blocking)
@@ -414,37 +562,31 @@ class CPUSimApp:
         self.status_label.config(text="Running batch (this may take a little while)...")
 
         def run_batch_thread():
-            schedulers = ["Deadline-Safe", "Performance-First"]
+            schedulers = list(POLICIES)
             n_tests = 5
             results = []
             graphs_out = os.path.join(graphs_dir, "batch_graphs")
             os.makedirs(graphs_out, exist_ok=True)
 
-            for sched in schedulers:
-                for seed in range(1, n_tests+1):
-                    tasks = generate_workload(seed=seed, n=30)
-                    stepper = DeadlineSafeStepper(tasks) if sched == "Deadline-Safe" else PerformanceFirstStepper(tasks)
-                    # run to completion (fast, non-GUI)
-                    while stepper.step(DT):
-                        pass
-                    total_tasks = len(stepper.tasks)
-                    missed = sum(1 for t in stepper.tasks if (t.deadline is not None and ((t.finish_time is not None and t.finish_time > t.deadline) or (not t.is_done() and stepper.now > t.deadline))))
-                    energy = stepper.energy
-                    results.append({"scheduler":sched, "seed":seed, "energy":energy, "tasks":total_tasks, "missed":missed})
-
-                    # save per-run energy plot
-                    try:
-                        plt.figure(figsize=(6,4))
-                        plt.plot(stepper.history["t"], stepper.history["energy"], label="Cumulative Energy")
-                        plt.xlabel("Time (s)")
-                        plt.ylabel("Energy (J)")
-                        plt.title(f"{sched} (seed={seed})")
-                        plt.grid(True)
-                        outname = os.path.join(graphs_out, f"{sched.replace(' ','_')}_seed{seed}.png")
-                        plt.savefig(outname)
-                        plt.close()
-                    except Exception as e:
-                        print("Warning: failed to save graph:", e)
+            # every (scheduler, seed) pair runs in a single parallel (prange) kernel call
+            runs = [(sched, seed) for sched in schedulers for seed in range(1, n_tests+1)]
+            for row, hist_t, hist_energy in _simulate_batch(runs):
+                sched, seed = row["scheduler"], row["seed"]
+                results.append(row)
+
+                # save per-run energy plot (plain Agg Figure: no pyplot registry from this thread)
+                try:
+                    fig = Figure(figsize=(6,4))
+                    ax = fig.add_subplot(111)
+                    ax.plot(hist_t, hist_energy, label="Cumulative Energy")
+                    ax.set_xlabel("Time (s)")
+                    ax.set_ylabel("Energy (J)")
+                    ax.set_title(f"{sched} (seed={seed})")
+                    ax.grid(True)
+                    outname = os.path.join(graphs_out, f"{sched.replace(' ','_')}_seed{seed}.png")
+                    FigureCanvasAgg(fig).print_png(outname)
+                except Exception as e:
+                    print("Warning: failed to save graph:", e)
 
             # write CSV
             try:
@@ -0,0 +1,28 @@
+import pytest
+
+import cpu_simulator_fixed as sim
+
+# labels interleaved so a mode array built out of order, or histories sliced with the wrong row's step count, shows up
+LABELS = sorted(sim.POLICIES)
+RUNS = [(LABELS[(seed + k) % len(LABELS)], seed) for k in range(2) for seed in (1, 2, 3, 7, 13, 42)]
+assert {label for label, _ in RUNS} == set(LABELS)
+
+
+@pytest.fixture(scope="module")
+def batch():
+    return sim._simulate_batch(RUNS)
+
+
+@pytest.mark.parametrize("r", range(len(RUNS)))
+def test_batch_row_matches_stepper(batch, r):
+    label, seed = RUNS[r]
+    row, hist_t, hist_energy = batch[r]
+    stepper = sim.Stepper(*sim.generate_workload(seed=seed, n=30), policy=sim.POLICIES[label])
+    while stepper.step(sim.DT):
+        pass
+    assert (row["scheduler"], row["seed"], row["tasks"]) == (label, seed, 30)
+    assert row["energy"] == pytest.approx(stepper.energy, rel=1e-12)
+    assert row["missed"] == stepper.missed()
+    assert len(hist_t) == len(hist_energy) == stepper.i
+    assert hist_t[-1] == stepper.hist_t[stepper.i-1]
+    assert hist_energy[-1] == pytest.approx(row["energy"], rel=1e-12)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+import cpu_simulator_fixed as sim
+
+SEEDS = range(1, 51)
+POLICY_SEEDS = [(policy, seed) for policy in sorted(sim.KERNEL_MODES) for seed in SEEDS]
+TINY = 1e-9
+
+
+def run_stepper(workload, policy):
+    stepper = sim.Stepper(*workload, policy=policy)
+    while stepper.step(sim.DT):
+        pass
+    return stepper
+
+
+def run_kernel(workload, policy):
+    return sim.run_to_completion(
+        *workload, sim.KERNEL_MODES[policy], np.array(sim.FREQ_LEVELS), sim.MAX_CORES, sim.DT, sim.SIM_DURATION)
+
+
+def step_capacity(freq_idx, cores):
+    # work-seconds one step can serve (same cap_sec as Stepper.step)
+    return sim.CPS_TABLE[freq_idx, cores-1] * sim.DT / (sim.PERF_CONSTANT * 1000.0)
+
+
+@pytest.mark.parametrize("policy,seed", POLICY_SEEDS)
+def test_stepper_matches_kernel(policy, seed):
+    workload = sim.generate_workload(seed=seed, n=30)
+    stepper = run_stepper(workload, policy)
+    energy, missed, hist_t, *_ = run_kernel(workload, policy)
+    assert stepper.energy == pytest.approx(energy, rel=1e-12)
+    assert stepper.missed() == missed
+    assert stepper.i == len(hist_t)
+
+
+@pytest.mark.parametrize("policy,seed", POLICY_SEEDS)
+def test_stepper_never_stalls(policy, seed):
+    # every step serves min(capacity, pending ready work), and no sliver of work outlives a step
+    workload = sim.generate_workload(seed=seed, n=30)
+    stepper = sim.Stepper(*workload, policy=policy)
+    slivers = set()
+    while not stepper.is_finished():
+        now, rem_before = stepper.now, stepper.rem.copy()
+        stepper.step(sim.DT)
+        ready = (stepper.arrival <= now) & (rem_before > 0)
+        work_done = (rem_before - stepper.rem).sum()
+        expected = min(step_capacity(stepper.freq_idx, stepper.cores), rem_before[ready].sum())
+        assert work_done == pytest.approx(expected, rel=1e-12, abs=1e-15), now
+        tiny = set(np.flatnonzero((stepper.rem > 0) & (stepper.rem < TINY)))
+        assert not (tiny & slivers), now
+        slivers = tiny
+
+
+@pytest.mark.parametrize("policy,seed", POLICY_SEEDS)
+def test_kernel_never_stalls(policy, seed):
+    # rebuild pending ready work per step from the kernel's own history to cover its `do <= 0` break
+    wcet, arrival, deadline = workload = sim.generate_workload(seed=seed, n=30)
+    _, _, hist_t, _, hist_freq, hist_cores, hist_util = run_kernel(workload, policy)
+    work_done = hist_util * hist_cores * hist_freq * sim.DT
+    now_before = np.concatenate(([0.0], hist_t[:-1]))
+    done_before = np.concatenate(([0.0], np.cumsum(work_done)[:-1]))
+    for k, now in enumerate(now_before):
+        pending = wcet[arrival <= now].sum() - done_before[k]
+        cap = hist_freq[k] * hist_cores[k] * sim.DT
+        assert work_done[k] == pytest.approx(min(cap, pending), abs=1e-9), now
+    # a run that stops before SIM_DURATION has served every task in full
+    if hist_t[-1] < sim.SIM_DURATION:
+        assert work_done.sum() == pytest.approx(wcet.sum(), abs=1e-9)